@@ -1,23 +1,73 @@
 from collections import namedtuple
+from types import SimpleNamespace
 
 import pytest
 from playwright.async_api import async_playwright
 
+from jupyterhub.utils import url_path_join
+
 from ..conftest import add_user, new_username
+from ..utils import public_host
 
 
-@pytest.fixture()
-async def browser():
+@pytest.fixture(scope="module")
+async def playwright_browser():
+    """Launch one browser per test module
+
+    module-scoped to match the event loop and the `app` fixture
+    """
     # browser_type in ["chromium", "firefox", "webkit"]
     async with async_playwright() as playwright:
         browser = await playwright.firefox.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        yield page
-        await context.clear_cookies()
+        yield browser
         await browser.close()
 
 
+async def login_with_request(context, login_url, username, password=None):
+    """Log in to the Hub through the context's HTTP client
+
+    Submits the login form without rendering it.
+    The resulting cookies are stored in the browser context.
+    Returns the redirect response.
+    """
+    if password is None:
+        password = username
+    # the login page sets the _xsrf cookie the form must be submitted with
+    r = await context.request.get(login_url)
+    assert r.ok
+    cookies = await context.cookies(login_url)
+    xsrf = next(c["value"] for c in cookies if c["name"] == "_xsrf")
+    r = await context.request.post(
+        login_url,
+        form={"_xsrf": xsrf, "username": username, "password": password},
+        # don't follow the redirect, which may spawn the user's server
+        max_redirects=0,
+    )
+    assert r.status == 302
+    return r
+
+
+@pytest.fixture()
+async def browser_context(request, playwright_browser):
+    """A fresh browser context (cookies, storage) for each test
+
+    Tests marked with `authed` start logged in as `user_special_chars`.
+    """
+    context = await playwright_browser.new_context()
+    if request.node.get_closest_marker("authed"):
+        user = request.getfixturevalue("user_special_chars").user
+        urls = request.getfixturevalue("urls")
+        await login_with_request(context, urls.login, user.name)
+    yield context
+    await context.close()
+
+
+@pytest.fixture()
+async def browser(browser_context):
+    """A page in the per-test browser context"""
+    return await browser_context.new_page()
+
+
 @pytest.fixture
 def user_special_chars(app):
     """Fixture for creating a temporary user with special characters in the name"""
@@ -26,3 +76,16 @@ def user_special_chars(app):
         user,
         user.name.replace("<'&\">", "%3C%27%26%22%3E"),
     )
+
+
+@pytest.fixture(scope="module")
+def urls(app):
+    """Public URLs of the Hub pages visited by the browser tests"""
+    hub_base = url_path_join(public_host(app), app.hub.base_url)
+    return SimpleNamespace(
+        hub_base=hub_base,
+        login=url_path_join(hub_base, "login"),
+        home=url_path_join(hub_base, "home"),
+        token=url_path_join(hub_base, "token"),
+        admin=url_path_join(hub_base, "admin"),
+    )
@@ -4,51 +4,134 @@ import asyncio
 import json
 import pprint
 import re
+from functools import lru_cache
 from unittest import mock
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs, parse_qsl, urlencode, urljoin, urlparse
 
 import pytest
+from bs4 import BeautifulSoup
 from playwright.async_api import expect
 from tornado.escape import url_escape
-from tornado.httputil import url_concat
 
 from jupyterhub import orm, roles, scopes
 from jupyterhub.tests.test_named_servers import named_servers  # noqa
 from jupyterhub.tests.utils import async_requests, public_host, public_url, ujoin
 from jupyterhub.utils import url_escape_path, url_path_join
 
+from .conftest import login_with_request
+
 pytestmark = pytest.mark.browser
 
+# default expect() timeout (ms), tighter than playwright's 5s to fail fast
+_EXPECT_TIMEOUT = 2_000
+# timeout (ms) for expectations that wait on a server to start or stop
+_SPAWN_TIMEOUT = 30_000
+
+
+@pytest.fixture(autouse=True)
+def expect_timeout():
+    """Use the tighter expect() timeout for the tests in this module"""
+    expect.set_options(timeout=_EXPECT_TIMEOUT)
+    yield
+    # restore playwright's default
+    expect.set_options(timeout=None)
+
+
+@lru_cache(maxsize=256)
+def _suffix_re(s):
+    """Compiled regex matching any string ending with the literal `s`
+
+    playwright searches for the pattern,
+    so it also matches strings containing `s`.
+    """
+    return re.compile('.*' + re.escape(s))
+
+
+_LOGIN_URL_RE = _suffix_re("/login")
+_HUB_LOGIN_URL_RE = _suffix_re("/hub/login")
+
+
+def _qjoin(url, params):
+    """Append query parameters to url
 
-async def login(browser, username, password=None):
-    """filling the login form by user and pass_w parameters and initiate the login"""
+    Lightweight replacement for tornado's url_concat,
+    which is all the browser tests need
+    """
+    if not params:
+        return url
+    sep = '&' if '?' in url else '?'
+    return f"{url}{sep}{urlencode(params)}"
+
+
+async def login(browser, username, password=None, fast=False):
+    """filling the login form by user and pass_w parameters and initiate the login
+
+    With fast=True, the form of the current login page is posted over HTTP
+    instead of filled in, and the browser goes straight to the redirect target.
+    """
     if password is None:
         password = username
 
-    await browser.get_by_label("Username:").click()
+    if fast:
+        r = await login_with_request(browser.context, browser.url, username, password)
+        await browser.goto(urljoin(browser.url, r.headers["location"]))
+        return
+
+    # fill() focuses the field itself, no need to click it first
     await browser.get_by_label("Username:").fill(username)
-    await browser.get_by_label("Password:").click()
     await browser.get_by_label("Password:").fill(password)
     await browser.get_by_role("button", name="Sign in").click()
 
 
-async def test_open_login_page(app, browser):
-    login_url = url_path_join(public_host(app), app.hub.base_url, "login")
-    await browser.goto(login_url)
-    await expect(browser).to_have_url(re.compile(r".*/login"))
+class LoggedInPage:
+    """A browser page that logs in as `user` on its first navigation"""
+
+    def __init__(self, app, browser, urls, user):
+        self.app = app
+        self.browser = browser
+        self.urls = urls
+        self.user = user
+        self.logged_in = False
+
+    async def goto(self, path):
+        """Open a Hub page, given relative to the Hub's base url
+
+        The first call goes through the login form with `?next=` set to the page.
+        """
+        hub_path = url_path_join(self.app.hub.base_url, path)
+        if self.logged_in:
+            await self.browser.goto(url_path_join(self.urls.hub_base, path))
+        else:
+            await self.browser.goto(_qjoin(self.urls.login, {"next": hub_path}))
+            await login(self.browser, self.user.name, password=self.user.name)
+            self.logged_in = True
+        await expect(self.browser).to_have_url(_suffix_re(hub_path))
+
+
+@pytest.fixture
+def logged_in_page(request, app, browser, urls, user_special_chars):
+    """Open Hub pages logged in as user_special_chars"""
+    page = LoggedInPage(app, browser, urls, user_special_chars.user)
+    # the browser context of `authed` tests is already logged in
+    page.logged_in = request.node.get_closest_marker("authed") is not None
+    return page
+
+
+async def test_open_login_page(app, browser, urls):
+    await browser.goto(urls.login)
+    await expect(browser).to_have_url(_LOGIN_URL_RE)
     await expect(browser).to_have_title("JupyterHub")
-    form = browser.locator('//*[@id="login-main"]/form')
+    form = browser.locator("#login-main > form")
     await expect(form).to_be_visible()
-    await expect(form.locator('//h1')).to_have_text("Sign in")
+    await expect(form.locator("h1")).to_have_text("Sign in")
 
 
-async def test_submit_login_form(app, browser, user_special_chars):
+async def test_submit_login_form(app, browser, urls, user_special_chars):
     user = user_special_chars.user
-    login_url = url_path_join(public_host(app), app.hub.base_url, "login")
-    await browser.goto(login_url)
+    await browser.goto(urls.login)
     await login(browser, user.name, password=user.name)
     expected_url = public_url(app, user)
-    await expect(browser).to_have_url(expected_url)
+    await expect(browser).to_have_url(expected_url, timeout=_SPAWN_TIMEOUT)
 
 
 @pytest.mark.parametrize(
@@ -103,68 +186,74 @@ async def test_open_url_login(
     await browser.goto(login_url)
     if params.get("next"):
         params["next"] = url_path_join(app.base_url, params["next"])
-    url_new = url_path_join(public_host(app), app.hub.base_url, url_concat(url, params))
-    print(url_new)
+    url_new = url_path_join(public_host(app), app.hub.base_url, _qjoin(url, params))
     await browser.goto(url_new)
     redirected_url = redirected_url.replace(
         '{{BASE_URL}}', url_escape_path(app.base_url)
     )
     form_action = form_action.replace('{{BASE_URL}}', url_escape(app.base_url))
 
-    form = browser.locator('//*[@id="login-main"]/form')
+    form = browser.locator("#login-main > form")
 
     # verify title / url
     await expect(browser).to_have_title("JupyterHub")
-    f_string = re.escape(f"{form_action}")
-    await expect(form).to_have_attribute('action', re.compile('.*' + f_string))
+    await expect(form).to_have_attribute('action', _suffix_re(form_action))
 
     # login in with params
     await login(browser, user.name, password=user.name)
     # verify next url + params
     if url_escape(app.base_url) in form_action:
-        await expect(browser).to_have_url(re.compile(".*param=value"))
+        await expect(browser).to_have_url(
+            _suffix_re("param=value"), timeout=_SPAWN_TIMEOUT
+        )
     elif "next=%2Fhub" in form_action:
-        escaped_string = re.escape('spawn?param=value')
-        pattern = re.compile('.*' + escaped_string)
-        await expect(browser).to_have_url(re.compile(pattern))
-        await expect(browser).not_to_have_url(re.compile(".*/user/.*"))
+        await expect(browser).to_have_url(_suffix_re('spawn?param=value'))
+        await expect(browser).not_to_have_url(_suffix_re("/user/"))
     else:
         await expect(browser).to_have_url(
-            re.compile(".*/user/" + f"{user_special_chars.urlname}/")
+            _suffix_re(f"/user/{user_special_chars.urlname}/"),
+            timeout=_SPAWN_TIMEOUT,
         )
 
 
 @pytest.mark.parametrize(
     "username, pass_w",
     [
-        (" ", ""),
-        ("user", ""),
+        # empty username, rejected by username validation
+        ("", ""),
+        # whitespace username, rejected by username validation
         (" ", "password"),
+        # valid username, rejected by authentication
         ("user", "password"),
     ],
 )
-async def test_login_with_invalid_credentials(app, browser, username, pass_w):
-    login_url = url_path_join(public_host(app), app.hub.base_url, "login")
-    await browser.goto(login_url)
+async def test_login_with_invalid_credentials(app, browser, urls, username, pass_w):
+    await browser.goto(urls.login)
     await login(browser, username, pass_w)
     locator = browser.locator("p.login_error")
     expected_error_message = "Invalid username or password"
     # verify error message displayed and user stays on login page
     await expect(locator).to_be_visible()
     await expect(locator).to_contain_text(expected_error_message)
-    await expect(browser).to_have_url(re.compile(".*/hub/login"))
+    await expect(browser).to_have_url(_HUB_LOGIN_URL_RE)
 
 
-@pytest.mark.parametrize("request_otp", [True, False])
-async def test_login_otp(request, app, browser, username, request_otp):
-    def _reset():
-        app.authenticator.request_otp = False
+@pytest.fixture(params=[True, False])
+def request_otp(app, request):
+    """Toggle Authenticator.request_otp for a single test"""
+    # request_otp is a trait, restore it by assignment
+    # (mock.patch.object would try to delete it)
+    before = app.authenticator.request_otp
+    app.authenticator.request_otp = request.param
+    try:
+        yield request.param
+    finally:
+        app.authenticator.request_otp = before
 
-    request.addfinalizer(_reset)
 
-    app.authenticator.request_otp = request_otp
-    login_url = url_concat(
-        url_path_join(public_host(app), app.hub.base_url, "login"),
+async def test_login_otp(app, browser, urls, username, request_otp):
+    login_url = _qjoin(
+        urls.login,
         {"next": ujoin(public_url(app), "/hub/home/")},
     )
     await browser.goto(login_url)
@@ -205,72 +294,54 @@ async def test_login_otp(request, app, browser, username, request_otp):
 # SPAWNING
 
 
-async def open_spawn_pending(app, browser, user_special_chars):
-    user = user_special_chars.user
-    url = url_path_join(
-        public_host(app),
-        url_concat(
-            url_path_join(app.base_url, "login"),
-            {"next": url_path_join(app.base_url, "hub/home")},
-        ),
-    )
-    await browser.goto(url)
-    await login(browser, user.name, password=user.name)
-    url_spawn = url_path_join(
-        public_host(app),
-        app.hub.base_url,
-        '/spawn-pending/' + user_special_chars.urlname,
-    )
-    await browser.goto(url_spawn)
-    await expect(browser).to_have_url(url_spawn)
-
-
 async def test_spawn_pending_server_not_started(
-    app, browser, no_patience, user_special_chars, slow_spawn
+    app, browser, logged_in_page, no_patience, user_special_chars, slow_spawn
 ):
     user = user_special_chars.user
     # first request, no spawn is pending
     # spawn-pending shows button linking to spawn
-    await open_spawn_pending(app, browser, user_special_chars)
+    await logged_in_page.goto(f"spawn-pending/{user_special_chars.urlname}")
     # on the page verify the button and expected information
     expected_heading = "Server not running"
-    heading = browser.locator('//div[@class="text-center"]').get_by_role("heading")
+    heading = browser.locator("div.text-center").get_by_role("heading")
     await expect(heading).to_have_text(expected_heading)
     await expect(heading).to_be_visible()
     expected_button_name = "Launch Server"
-    launch_btn = browser.locator('//div[@class="text-center"]').get_by_role("button")
-    await expect(launch_btn).to_have_text(expected_button_name)
-    await expect(launch_btn).to_have_id("start")
-    await expect(launch_btn).to_be_enabled()
-    await expect(launch_btn).to_have_count(1)
-    f_string = re.escape(f"/hub/spawn/{user_special_chars.urlname}")
-    await expect(launch_btn).to_have_attribute('href', re.compile('.*' + f_string))
+    launch_btn = browser.locator("div.text-center").get_by_role("button")
+    # independent checks, awaited concurrently
+    await asyncio.gather(
+        expect(launch_btn).to_have_text(expected_button_name),
+        expect(launch_btn).to_have_id("start"),
+        expect(launch_btn).to_be_enabled(),
+        expect(launch_btn).to_have_count(1),
+        expect(launch_btn).to_have_attribute(
+            'href', _suffix_re(f"/hub/spawn/{user_special_chars.urlname}")
+        ),
+    )
 
 
 async def test_spawn_pending_progress(
-    app, browser, no_patience, user_special_chars, slow_spawn
+    app, browser, logged_in_page, no_patience, user_special_chars, slow_spawn
 ):
     """verify that the server process messages are showing up to the user
     when the server is going to start up"""
 
     user = user_special_chars.user
     urlname = user_special_chars.urlname
+    user_url_re = _suffix_re(f"/user/{urlname}/")
     # visit the spawn-pending page
-    await open_spawn_pending(app, browser, user_special_chars)
-    launch_btn = browser.locator("//div[@class='text-center']").get_by_role(
+    await logged_in_page.goto(f"spawn-pending/{urlname}")
+    launch_btn = browser.locator("div.text-center").get_by_role(
         "button", name="Launch Server"
     )
-    await expect(launch_btn).to_be_enabled()
 
     # begin starting the server
-    async with browser.expect_navigation(
-        url=re.compile(".*/spawn-pending/" + f"{urlname}")
-    ):
+    async with browser.expect_navigation(url=_suffix_re(f"/spawn-pending/{urlname}")):
         await launch_btn.click()
     # wait for progress message to appear
     progress = browser.locator("#progress-message")
     progress_message = await progress.inner_text()
-    async with browser.expect_navigation(url=re.compile(".*/user/" + f"{urlname}/")):
+    async with browser.expect_navigation(url=user_url_re):
         # wait for log messages to appear
         expected_messages = [
             "Server requested",
@@ -278,10 +349,9 @@ async def test_spawn_pending_progress(
             f"Server ready at {app.base_url}user/{urlname}/",
         ]
         while not user.spawner.ready:
-            logs_list = [
-                await log.inner_text()
-                for log in await browser.locator("div.progress-log-event").all()
-            ]
+            logs_list = await browser.locator("div.progress-log-event").evaluate_all(
+                "els => els.map(e => e.innerText)"
+            )
             if progress_message:
                 assert progress_message in expected_messages
             # race condition: progress_message _should_
@@ -289,26 +359,27 @@ async def test_spawn_pending_progress(
             if logs_list:
                 assert progress_message
             assert logs_list == expected_messages[: len(logs_list)]
-    await expect(browser).to_have_url(re.compile(".*/user/" + f"{urlname}/"))
+            # don't poll the page faster than the spawner can make progress
+            await asyncio.sleep(0.05)
+    await expect(browser).to_have_url(user_url_re)
     assert user.spawner.ready
 
 
-async def test_spawn_pending_server_ready(app, browser, user_special_chars):
+async def test_spawn_pending_server_ready(
+    app, browser, logged_in_page, urls, user_special_chars
+):
     """verify that after a successful launch server via the spawn-pending page
     the user should see two buttons on the home page"""
 
     user = user_special_chars.user
-    await open_spawn_pending(app, browser, user_special_chars)
+    await logged_in_page.goto(f"spawn-pending/{user_special_chars.urlname}")
     launch_btn = browser.get_by_role("button", name="Launch Server")
     await launch_btn.click()
-    await browser.wait_for_selector("button", state="detached")
-    home_page = url_path_join(public_host(app), ujoin(app.base_url, "hub/home"))
-    await browser.goto(home_page)
+    await launch_btn.wait_for(state="detached")
+    await browser.goto(urls.home)
     await browser.wait_for_load_state("domcontentloaded")
     # checking that server is running and two butons present on the home page
-    stop_start_btns = browser.locator('//div[@class="text-center"]').get_by_role(
-        "button"
-    )
+    stop_start_btns = browser.locator("div.text-center").get_by_role("button")
     expected_btns_name = ["Stop My Server", "My Server"]
     await expect(stop_start_btns).to_have_count(2)
     await expect(stop_start_btns).to_have_text(expected_btns_name)
@@ -319,38 +390,27 @@ async def test_spawn_pending_server_ready(app, browser, user_special_chars):
 # HOME PAGE
 
 
-async def open_home_page(app, browser, user):
-    """function to open the home page"""
-
-    home_page = url_escape(app.base_url) + "hub/home"
-    url = url_path_join(public_host(app), app.hub.base_url, "/login?next=" + home_page)
-    await browser.goto(url)
-    await login(browser, user.name, password=str(user.name))
-    await expect(browser).to_have_url(re.compile(".*/hub/home"))
-
-
-async def test_start_button_server_not_started(app, browser, user_special_chars):
+async def test_start_button_server_not_started(
+    app, browser, logged_in_page, urls, user_special_chars
+):
     """verify that when server is not started one button is available,
     after starting 2 buttons are available"""
-    user = user_special_chars.user
     urlname = user_special_chars.urlname
-    await open_home_page(app, browser, user)
+    await logged_in_page.goto("home")
     # checking that only one button is presented
-    start_stop_btns = browser.locator('//div[@class="text-center"]').get_by_role(
-        "button"
-    )
+    start_stop_btns = browser.locator("div.text-center").get_by_role("button")
     expected_btn_name = "Start My Server"
     await expect(start_stop_btns).to_be_enabled()
     await expect(start_stop_btns).to_have_count(1)
     await expect(start_stop_btns).to_have_text(expected_btn_name)
-    f_string = re.escape(f"/hub/spawn/{urlname}")
-    await expect(start_stop_btns).to_have_attribute('href', re.compile('.*' + f_string))
-    async with browser.expect_navigation(url=re.compile(".*/user/" + f"{urlname}/")):
+    await expect(start_stop_btns).to_have_attribute(
+        'href', _suffix_re(f"/hub/spawn/{urlname}")
+    )
+    async with browser.expect_navigation(url=_suffix_re(f"/user/{urlname}/")):
         # Start server via clicking on the Start button
         await start_stop_btns.click()
     # return to Home page
-    next_url = url_path_join(public_host(app), app.base_url, '/hub/home')
-    await browser.goto(next_url)
+    await browser.goto(urls.home)
     # verify that 2 buttons are displayed on the home page
     await expect(start_stop_btns).to_have_count(2)
     expected_btns_names = ["Stop My Server", "My Server"]
@@ -359,38 +419,35 @@ async def test_start_button_server_not_started(app, browser, user_special_chars)
         await expect(start_stop_btn).to_be_enabled()
         for start_stop_btn in await start_stop_btns.all()
     ]
-    f_string = re.escape(f"/user/{urlname}")
     await expect(start_stop_btns.nth(1)).to_have_attribute(
-        'href', re.compile('.*' + f_string)
+        'href', _suffix_re(f"/user/{urlname}")
     )
     await expect(start_stop_btns.nth(0)).to_have_id("stop")
     await expect(start_stop_btns.nth(1)).to_have_id("start")
 
 
-async def test_stop_button(app, browser, user_special_chars):
+async def test_stop_button(app, browser, logged_in_page, urls, user_special_chars):
     """verify that the stop button after stopping a server is not shown
     the start button is displayed with new name"""
 
     user = user_special_chars.user
-    await open_home_page(app, browser, user)
+    await logged_in_page.goto("home")
     # checking that only one button is presented
-    start_stop_btns = browser.locator('//div[@class="text-center"]').get_by_role(
-        "button"
-    )
+    start_stop_btns = browser.locator("div.text-center").get_by_role("button")
     async with browser.expect_navigation(
-        url=re.compile(".*/user/" + re.escape(user_special_chars.urlname) + "/")
+        url=_suffix_re(f"/user/{user_special_chars.urlname}/")
     ):
         # Start server via clicking on the Start button
         await start_stop_btns.click()
     assert user.spawner.ready
-    next_url = url_path_join(public_host(app), app.base_url, '/hub/home')
-    await browser.goto(next_url)
+    await browser.goto(urls.home)
     await expect(start_stop_btns.nth(0)).to_have_id("stop")
     # Stop server via clicking on the "Stop My Server"
     await start_stop_btns.nth(0).click()
-    await expect(start_stop_btns).to_have_count(1)
-    f_string = re.escape(f"/hub/spawn/{user.name}")
-    await expect(start_stop_btns).to_have_attribute('href', re.compile('.*' + f_string))
+    await expect(start_stop_btns).to_have_count(1, timeout=_SPAWN_TIMEOUT)
+    await expect(start_stop_btns).to_have_attribute(
+        'href', _suffix_re(f"/hub/spawn/{user.name}")
+    )
     expected_btn_name = "Start My Server"
     await expect(start_stop_btns).to_have_text(expected_btn_name)
     await expect(start_stop_btns).to_have_id("start")
@@ -399,21 +456,14 @@ async def test_stop_button(app, browser, user_special_chars):
 # TOKEN PAGE
 
 
-async def open_token_page(app, browser, user):
-    """function to open the token page"""
-
-    token_page = url_escape(app.base_url) + "hub/token"
-    url = url_path_join(public_host(app), app.hub.base_url, "/login?next=" + token_page)
-    await browser.goto(url)
-    await login(browser, user.name, password=str(user.name))
-    await expect(browser).to_have_url(re.compile(".*/hub/token"))
-
-
-async def test_token_request_form_and_panel(app, browser, user_special_chars):
+@pytest.mark.authed
+async def test_token_request_form_and_panel(
+    app, browser, logged_in_page, user_special_chars
+):
     """verify elements of the request token form"""
 
-    await open_token_page(app, browser, user_special_chars.user)
-    request_btn = browser.locator('//div[@class="text-center"]').get_by_role("button")
+    await logged_in_page.goto("token")
+    request_btn = browser.locator("div.text-center").get_by_role("button")
     expected_btn_name = 'Request new API token'
     # check if the request token button is enabled
     # check the buttons name
@@ -421,23 +471,23 @@ async def test_token_request_form_and_panel(app, browser, user_special_chars):
     await expect(request_btn).to_have_text(expected_btn_name)
     # check that the field is enabled and editable and empty by default
     field_note = browser.get_by_label('Note')
-    await expect(field_note).to_be_editable()
-    await expect(field_note).to_be_enabled()
-    await expect(field_note).to_be_empty()
+    field_note_state = await field_note.evaluate(
+        "el => ({editable: !el.readOnly, enabled: !el.disabled, empty: el.value === ''})"
+    )
+    assert field_note_state == {"editable": True, "enabled": True, "empty": True}
 
     # check the list of tokens duration
     dropdown = browser.locator('#token-expiration-seconds')
-    options = await dropdown.locator('option').all()
     expected_values_in_list = {
         '1 Hour': '3600',
         '1 Day': '86400',
         '1 Week': '604800',
         'Never': '',
     }
-    actual_values = {
-        await option.text_content(): await option.get_attribute('value')
-        for option in options
-    }
+    # collect all options in one round-trip
+    actual_values = await dropdown.evaluate(
+        "el => Object.fromEntries([...el.options].map(o => [o.textContent, o.value]))"
+    )
     assert actual_values == expected_values_in_list
     # get the value of the 'selected' attribute of the currently selected option
     selected_value = dropdown.locator('option[selected]')
@@ -445,25 +495,27 @@ async def test_token_request_form_and_panel(app, browser, user_special_chars):
 
     # check scopes field
     scopes_input = browser.get_by_label("Permissions")
-    await expect(scopes_input).to_be_editable()
-    await expect(scopes_input).to_be_enabled()
-    await expect(scopes_input).to_be_empty()
+    await asyncio.gather(
+        expect(scopes_input).to_be_editable(),
+        expect(scopes_input).to_be_enabled(),
+        expect(scopes_input).to_be_empty(),
+    )
 
     # verify that "Your new API Token" panel shows up with the new API token
     await request_btn.click()
-    await browser.wait_for_load_state("load")
+    await browser.wait_for_load_state("domcontentloaded")
     expected_panel_token_heading = "Your new API Token"
     token_area = browser.locator('#token-area')
     await expect(token_area).to_be_visible()
-    token_area_heading = token_area.locator('//div[@class="panel-heading"]')
+    token_area_heading = token_area.locator("div.panel-heading")
     await expect(token_area_heading).to_have_text(expected_panel_token_heading)
     token_result = browser.locator('#token-result')
     await expect(token_result).not_to_be_empty()
     await expect(token_result).to_be_visible()
     # verify that "Your new API Token" panel is hidden after refresh the page
-    await browser.reload(wait_until="load")
+    await browser.reload(wait_until="domcontentloaded")
     await expect(token_area).to_be_hidden()
-    api_token_table_area = browser.locator('//div[@class="row"]').nth(2)
+    api_token_table_area = browser.locator("div.row").nth(2)
     await expect(api_token_table_area.get_by_role("table")).to_be_visible()
     expected_table_name = "API Tokens"
     await expect(api_token_table_area.get_by_role("heading")).to_have_text(
@@ -471,6 +523,18 @@ async def test_token_request_form_and_panel(app, browser, user_special_chars):
     )
 
 
+# expected "Expires at" column text for each token expiration option
+_EXPIRES_TEXT = {
+    "Never": "Never",
+    "1 Hour": "in an hour",
+    "1 Day": "in a day",
+    "1 Week": "in 7 days",
+    "server_up": "Never",
+}
+# expiration options that create tokens without an expiry
+_EXPIRES_IS_NONE = {"Never", "server_up"}
+
+
 @pytest.mark.parametrize(
     "token_opt, note",
     [
@@ -484,7 +548,7 @@ async def test_token_request_form_and_panel(app, browser, user_special_chars):
     ],
 )
 async def test_request_token_expiration(
-    app, browser, token_opt, note, user_special_chars
+    app, browser, logged_in_page, urls, token_opt, note, user_special_chars
 ):
     """verify request token with the different options"""
 
@@ -492,28 +556,27 @@ async def test_request_token_expiration(
     urlname = user_special_chars.urlname
     if token_opt == "server_up":
         # open the home page
-        await open_home_page(app, browser, user)
+        await logged_in_page.goto("home")
         # start server via clicking on the Start button
         async with browser.expect_navigation(url=f"**/user/{urlname}/"):
             await browser.locator("#start").click()
-        token_page = url_path_join(public_host(app), app.base_url, '/hub/token')
-        await browser.goto(token_page)
+        await browser.goto(urls.token)
     else:
         # open the token page
-        await open_token_page(app, browser, user)
+        await logged_in_page.goto("token")
         if token_opt not in ["Never", "server_up"]:
             await browser.get_by_label('Token expires').select_option(token_opt)
         if note:
             note_field = browser.get_by_role("textbox").first
             await note_field.fill(note)
         # click on Request token button
-        request_button = browser.locator('//button[@type="submit"]')
+        request_button = browser.locator("button[type=submit]")
         await request_button.click()
         # wait for token response to show up on the page
-        await browser.wait_for_load_state("load")
+        await browser.wait_for_load_state("domcontentloaded")
         token_result = browser.locator("#token-result")
         await expect(token_result).to_be_visible()
-        # reload the page
+        # reload the page, waiting for token.js to rewrite the timestamps
         await browser.reload(wait_until="load")
     # API Tokens table: verify that elements are displayed
     api_token_table_area = browser.locator("div#api-tokens-section").nth(0)
@@ -532,42 +595,18 @@ async def test_request_token_expiration(
         expected_note = "Requested via token page"
     assert orm_token.note == expected_note
 
-    note_on_page = (
+    # read all cells of the token row in one round-trip
+    cells = (
         await api_token_table_area.locator("tr.token-row")
         .get_by_role("cell")
-        .nth(0)
-        .inner_text()
+        .all_inner_texts()
     )
-
+    note_on_page, _, last_used_text, _, expires_at_text = cells[:5]
     assert note_on_page == expected_note
-
-    last_used_text = (
-        await api_token_table_area.locator("tr.token-row")
-        .get_by_role("cell")
-        .nth(2)
-        .inner_text()
-    )
     assert last_used_text == "Never"
-
-    expires_at_text = (
-        await api_token_table_area.locator("tr.token-row")
-        .get_by_role("cell")
-        .nth(4)
-        .inner_text()
-    )
-
-    if token_opt == "Never":
-        assert orm_token.expires_at is None
-        assert expires_at_text == "Never"
-    elif token_opt == "1 Hour":
-        assert expires_at_text == "in an hour"
-    elif token_opt == "1 Day":
-        assert expires_at_text == "in a day"
-    elif token_opt == "1 Week":
-        assert expires_at_text == "in 7 days"
-    elif token_opt == "server_up":
+    assert expires_at_text == _EXPIRES_TEXT[token_opt]
+    if token_opt in _EXPIRES_IS_NONE:
         assert orm_token.expires_at is None
-        assert expires_at_text == "Never"
     # verify that the button for revoke is presented
     revoke_btn = (
         api_token_table_area.locator("tr.token-row").get_by_role("button").nth(0)
@@ -597,16 +636,16 @@ async def test_request_token_expiration(
     ],
 )
 async def test_request_token_permissions(
-    app, browser, permissions_str, granted, user_special_chars
+    app, browser, logged_in_page, urls, permissions_str, granted, user_special_chars
 ):
     """verify request token with the different options"""
 
     user = user_special_chars.user
     # open the token page
-    await open_token_page(app, browser, user)
+    await logged_in_page.goto("token")
     scopes_input = browser.get_by_label("Permissions")
     await scopes_input.fill(permissions_str)
-    request_button = browser.locator('//button[@type="submit"]')
+    request_button = browser.locator("button[type=submit]")
     await request_button.click()
 
     if isinstance(granted, str):
@@ -621,25 +660,24 @@ async def test_request_token_permissions(
         assert expected_error in error_message
         return
 
-    await browser.reload(wait_until="load")
-
-    # API Tokens table: verify that elements are displayed
-    api_token_table_area = browser.locator("div#api-tokens-section").nth(0)
-    await expect(api_token_table_area.get_by_role("table")).to_be_visible()
-    await expect(api_token_table_area.locator("tr.token-row")).to_have_count(1)
+    # the new token is shown once the request has succeeded
+    await expect(browser.locator("#token-result")).to_be_visible()
 
     # getting values from DB to compare with values on UI
     assert len(user.api_tokens) == 1
     orm_token = user.api_tokens[-1]
     assert set(orm_token.scopes) == granted
 
-    permissions_on_page = (
-        await api_token_table_area.locator("tr.token-row")
-        .get_by_role("cell")
-        .nth(1)
-        .locator('//pre[@class="token-scope"]')
-        .all_text_contents()
-    )
+    # API Tokens table: fetch the rendered token page
+    # with the page's cookies, without navigating the browser
+    r = await browser.request.get(urls.token)
+    assert r.ok
+    token_page = BeautifulSoup(await r.text(), "html.parser")
+    token_rows = token_page.select("div#api-tokens-section tr.token-row")
+    assert len(token_rows) == 1
+    permissions_on_page = [
+        pre.get_text() for pre in token_rows[0].select("td.scope-col pre.token-scope")
+    ]
     # specifically use list to test that entries don't appear twice
     assert sorted(permissions_on_page) == sorted(granted)
 
@@ -652,12 +690,14 @@ async def test_request_token_permissions(
         ("both"),
     ],
 )
-async def test_revoke_token(app, browser, token_type, user_special_chars):
+async def test_revoke_token(
+    app, browser, logged_in_page, urls, token_type, user_special_chars
+):
     """verify API Tokens table content in case the server is started"""
 
     user = user_special_chars.user
     # open the home page
-    await open_home_page(app, browser, user)
+    await logged_in_page.goto("home")
     if token_type == "server_up" or token_type == "both":
         # Start server via clicking on the Start button
         async with browser.expect_navigation(
@@ -665,20 +705,18 @@ async def test_revoke_token(app, browser, token_type, user_special_chars):
         ):
             await browser.locator("#start").click()
     # open the token page
-    next_url = url_path_join(public_host(app), app.base_url, '/hub/token')
-    await browser.goto(next_url)
-    await browser.wait_for_load_state("load")
-    await expect(browser).to_have_url(re.compile(".*/hub/token"))
+    await browser.goto(urls.token)
+    await browser.wait_for_load_state("domcontentloaded")
+    await expect(browser).to_have_url(_suffix_re("/hub/token"))
     if token_type == "both" or token_type == "request_by_user":
-        request_btn = browser.locator('//div[@class="text-center"]').get_by_role(
-            "button"
-        )
+        request_btn = browser.locator("div.text-center").get_by_role("button")
         await request_btn.click()
         # wait for token response to show up on the page
-        await browser.wait_for_load_state("load")
+        await browser.wait_for_load_state("domcontentloaded")
         token_result = browser.locator("#token-result")
         await expect(token_result).to_be_visible()
-        # reload the page
+        # reload the page, waiting for "load"
+        # so the revoke buttons' handlers are attached before clicking them
         await browser.reload(wait_until="load")
 
     revoke_btns = browser.get_by_role("button", name="revoke")
@@ -686,23 +724,24 @@ async def test_revoke_token(app, browser, token_type, user_special_chars):
     # verify that the token revoked from UI and the database
     if token_type in {"server_up", "request_by_user"}:
         await expect(revoke_btns).to_have_count(1)
-        await expect(revoke_btns).to_have_count(len(user.api_tokens))
+        assert await revoke_btns.count() == len(user.api_tokens)
         # click Revoke button
         await revoke_btns.click()
         await expect(browser.locator("tr.token-row")).to_have_count(0)
         await expect(revoke_btns).to_have_count(0)
-        await expect(revoke_btns).to_have_count(len(user.api_tokens))
+        assert await revoke_btns.count() == len(user.api_tokens)
 
     if token_type == "both":
         # verify that both tokens are revoked from UI and the database
         revoke_btns = browser.get_by_role("button", name="revoke")
         await expect(revoke_btns).to_have_count(2)
         assert len(user.api_tokens) == 2
-        for button in await browser.query_selector_all('.revoke-token-btn'):
-            await button.click()
-            await browser.wait_for_load_state("domcontentloaded")
+        # click all the Revoke buttons at once, the revoke requests run in parallel
+        await browser.evaluate(
+            "() => document.querySelectorAll('.revoke-token-btn').forEach(b => b.click())"
+        )
         await expect(revoke_btns).to_have_count(0)
-        await expect(revoke_btns).to_have_count(len(user.api_tokens))
+        assert await revoke_btns.count() == len(user.api_tokens)
 
 
 # MENU BAR
@@ -712,28 +751,30 @@ async def test_revoke_token(app, browser, token_type, user_special_chars):
     "page, logged_in",
     [
         # the home page: verify if links work on the top bar
-        ("/hub/home", True),
+        pytest.param("/hub/home", True, marks=pytest.mark.authed),
         # the token page: verify if links work on the top bar
-        ("/hub/token", True),
+        pytest.param("/hub/token", True, marks=pytest.mark.authed),
         # "hub/not" = any url that is not existed: verify if links work on the top bar
-        ("hub/not", True),
+        pytest.param("hub/not", True, marks=pytest.mark.authed),
         # the login page: verify if links work on the top bar
         ("", False),
     ],
 )
 async def test_menu_bar(app, browser, page, logged_in, user_special_chars):
     user = user_special_chars.user
-    url = url_path_join(
-        public_host(app),
-        url_concat(
-            url_path_join(app.base_url, "/login?next="),
-            {"next": url_path_join(app.base_url, page)},
-        ),
-    )
+    if logged_in:
+        # already logged in by the authed mark
+        url = url_path_join(public_host(app), app.base_url, page)
+    else:
+        url = url_path_join(
+            public_host(app),
+            _qjoin(
+                url_path_join(app.base_url, "/login?next="),
+                {"next": url_path_join(app.base_url, page)},
+            ),
+        )
     await browser.goto(url)
-    if page:
-        await login(browser, user.name, password=user.name)
-    bar_link_elements = browser.locator('//div[@class="container-fluid"]//a')
+    bar_link_elements = browser.locator("div.container-fluid a")
 
     if not logged_in:
         await expect(bar_link_elements).to_have_count(1)
@@ -752,11 +793,11 @@ async def test_menu_bar(app, browser, page, logged_in, user_special_chars):
     for index in range(await bar_link_elements.count()):
         # verify that links on the topbar work, checking the titles of links
         link = bar_link_elements.nth(index)
-        await expect(bar_link_elements.nth(index)).to_have_attribute(
-            'href', re.compile('.*' + expected_link_bar_url[index])
-        )
-        await expect(bar_link_elements.nth(index)).to_have_text(
-            expected_link_bar_name[index]
+        await asyncio.gather(
+            expect(link).to_have_attribute(
+                'href', _suffix_re(expected_link_bar_url[index])
+            ),
+            expect(link).to_have_text(expected_link_bar_name[index]),
         )
         await link.click()
         if index == 0:
@@ -765,48 +806,47 @@ async def test_menu_bar(app, browser, page, logged_in, user_special_chars):
                 assert expected_url in browser.url
             else:
                 await expect(browser).to_have_url(
-                    re.compile(f".*/user/{user_special_chars.urlname}/")
+                    _suffix_re(f"/user/{user_special_chars.urlname}/"),
+                    timeout=_SPAWN_TIMEOUT,
                 )
                 await browser.go_back()
-                await expect(browser).to_have_url(re.compile(".*" + page))
+                await expect(browser).to_have_url(_suffix_re(page))
         elif index == 3:
-            await expect(browser).to_have_url(re.compile(".*/login"))
+            await expect(browser).to_have_url(_LOGIN_URL_RE)
         else:
-            await expect(browser).to_have_url(
-                re.compile(".*" + expected_link_bar_url[index])
-            )
+            await expect(browser).to_have_url(_suffix_re(expected_link_bar_url[index]))
 
 
 # LOGOUT
 
 
+@pytest.mark.authed
 @pytest.mark.parametrize(
     "url",
     [("/hub/home"), ("/hub/token"), ("/hub/spawn")],
 )
-async def test_user_logout(app, browser, url, user_special_chars):
+async def test_user_logout(app, browser, logged_in_page, url, user_special_chars):
     user = user_special_chars.user
     if "/hub/home" in url:
-        await open_home_page(app, browser, user)
+        await logged_in_page.goto("home")
     elif "/hub/token" in url:
-        await open_home_page(app, browser, user)
+        await logged_in_page.goto("token")
     elif "/hub/spawn" in url:
-        await open_spawn_pending(app, browser, user_special_chars)
+        await logged_in_page.goto(f"spawn-pending/{user_special_chars.urlname}")
     logout_btn = browser.get_by_role("button", name="Logout")
-    await expect(logout_btn).to_be_enabled()
     await logout_btn.click()
     # checking url changing to login url and login form is displayed
-    await expect(browser).to_have_url(re.compile(".*/hub/login"))
-    form = browser.locator('//*[@id="login-main"]/form')
+    await expect(browser).to_have_url(_HUB_LOGIN_URL_RE)
+    form = browser.locator("#login-main > form")
     await expect(form).to_be_visible()
-    bar_link_elements = browser.locator('//div[@class="container-fluid"]//a')
+    bar_link_elements = browser.locator("div.container-fluid a")
     await expect(bar_link_elements).to_have_count(1)
-    await expect(bar_link_elements).to_have_attribute('href', (re.compile(".*/hub/")))
+    await expect(bar_link_elements).to_have_attribute('href', _suffix_re("/hub/"))
 
     # verify that user can login after logout
-    await login(browser, user.name, password=user.name)
+    await login(browser, user.name, password=user.name, fast=True)
     await expect(browser).to_have_url(
-        re.compile(".*/user/" + f"{user_special_chars.urlname}/")
+        _suffix_re(f"/user/{user_special_chars.urlname}/"), timeout=_SPAWN_TIMEOUT
     )
 
 
@@ -850,11 +890,8 @@ async def test_oauth_page(
     service = mockservice_url
     user = create_user_with_scopes("access:services")
     roles.grant_role(app.db, user, service_role)
-    oauth_client = (
-        app.db.query(orm.OAuthClient)
-        .filter_by(identifier=service.oauth_client_id)
-        .one()
-    )
+    # the service's client, from its orm relationship (already in the session)
+    oauth_client = service.oauth_client
     oauth_client.allowed_scopes = sorted(roles.roles_to_scopes([service_role]))
     app.db.commit()
     # open the service url in the browser
@@ -870,16 +907,16 @@ async def test_oauth_page(
     expected_client_id = f"service-{service.name}"
 
     # decode the URL
-    query_params = parse_qs(urlparse(browser.url).query)
-    query_params = parse_qs(urlparse(query_params['next'][0]).query)
+    next_url = dict(parse_qsl(urlparse(browser.url).query))['next']
+    query_params = dict(parse_qsl(urlparse(next_url).query))
 
     # check if the client_id and redirected url in the browser_url
-    assert expected_client_id == query_params['client_id'][0]
-    assert expected_redirect_url == query_params['redirect_uri'][0]
+    assert expected_client_id == query_params['client_id']
+    assert expected_redirect_url == query_params['redirect_uri']
 
     # login user
     await login(browser, user.name, password=str(user.name))
-    auth_btn = browser.locator('//input[@type="submit"]')
+    auth_btn = browser.locator("input[type=submit]")
     await expect(auth_btn).to_be_enabled()
     text_permission = browser.get_by_role("paragraph")
     await expect(text_permission).to_contain_text(f"JupyterHub service {service.name}")
@@ -887,22 +924,22 @@ async def test_oauth_page(
 
     # verify that user can see the service name and oauth URL
     # permissions check
-    oauth_form = browser.locator('//form')
-    scopes_elements = await oauth_form.locator(
-        '//input[@type="hidden" and @name="scopes"]'
-    ).all()
-
+    oauth_form = browser.locator("form")
+    # the scope values and whether any is rendered, in one round-trip
+    # (hidden inputs aren't rendered, so they have no offsetParent)
+    scope_inputs = await oauth_form.locator(
+        "input[type=hidden][name=scopes]"
+    ).evaluate_all(
+        """els => ({
+            values: els.map(e => e.getAttribute("value")),
+            anyVisible: els.some(e => e.offsetParent !== null),
+        })"""
+    )
     # checking that scopes are invisible on the page
-    scope_list_oauth_page = [
-        await expect(scopes_element).not_to_be_visible()
-        for scopes_element in scopes_elements
-    ]
+    assert not scope_inputs["anyVisible"]
     # checking that all scopes granded to user are presented in POST form (scope_list)
-    scope_list_oauth_page = [
-        await scopes_element.get_attribute("value")
-        for scopes_element in scopes_elements
-    ]
-    assert all(x in scope_list_oauth_page for x in user_scopes)
+    scope_list_oauth_page = set(scope_inputs["values"])
+    assert set(user_scopes) <= scope_list_oauth_page
     assert f"access:services!service={service.name}" in scope_list_oauth_page
 
     # checking that user cannot uncheck the checkbox
@@ -913,9 +950,10 @@ async def test_oauth_page(
         await expect(check_box).to_have_value("title", "This authorization is required")
 
     # checking that appropriete descriptions are displayed depending of scopes
-    descriptions = await oauth_form.locator('//span').all()
-    desc_list_form = [await description.text_content() for description in descriptions]
-    desc_list_form = [" ".join(desc.split()) for desc in desc_list_form]
+    # collapse whitespace in the page, so the texts arrive normalized
+    desc_list_form = await oauth_form.locator("span").evaluate_all(
+        r"els => els.map(e => e.textContent.replace(/\s+/g, ' ').trim())"
+    )
 
     # getting descriptions from scopes.py to compare them with descriptions on UI
     scope_descriptions = scopes.describe_raw_scopes(
@@ -929,6 +967,7 @@ async def test_oauth_page(
         )
         for sd in scope_descriptions
     ]
+    # compare lists, so that descriptions don't appear twice
     assert sorted(desc_list_form) == sorted(desc_list_expected)
 
     # click on the Authorize button
@@ -938,7 +977,7 @@ async def test_oauth_page(
     # check the granted permissions by
     # getting the scopes from the service page,
     # which contains the JupyterHub user model
-    text = await browser.locator("//body").text_content()
+    text = await browser.locator("body").text_content()
     user_model = json.loads(text)
     authorized_scopes = user_model["scopes"]
     # resolve the expected expanded scopes
@@ -948,37 +987,81 @@ async def test_oauth_page(
     expected_scopes |= scopes.identify_scopes(user.orm_user)
 
     # compare the scopes on the service page with the expected scope list
+    # compare lists, so that scopes don't appear twice
     assert sorted(authorized_scopes) == sorted(expected_scopes)
 
 
 # ADMIN UI
 
 
-async def open_admin_page(app, browser, login_as=None):
-    """Login as `user` and open the admin page"""
-    admin_page = url_escape(app.base_url) + "hub/admin"
-    if login_as:
-        user = login_as
-        url = url_path_join(
-            public_host(app), app.hub.base_url, "/login?next=" + admin_page
-        )
-        await browser.goto(url)
-        await login(browser, user.name, password=str(user.name))
-        await expect(browser).to_have_url(re.compile(".*/hub/admin"))
-    else:
-        # url = url_path_join(public_host(app), app.hub.base_url, "/login?next=" + admin_page)
-        await browser.goto(admin_page)
-        await expect(browser).to_have_url(re.compile(".*/hub/admin"))
+@pytest.fixture(scope="module")
+async def admin_storage_state(app, playwright_browser, urls):
+    """Cookies of a logged-in session of the 'admin' user
+
+    Logged in once per module and shared by the admin page tests.
+    'admin' is not removed between tests, so the session stays valid.
+    """
+    context = await playwright_browser.new_context()
+    await login_with_request(context, urls.login, "admin")
+    state = await context.storage_state()
+    await context.close()
+    return state
+
+
+async def open_admin_page(browser, urls, storage_state=None):
+    """Open the admin page, with the session cookies from `storage_state`"""
+    if storage_state:
+        await browser.context.add_cookies(storage_state["cookies"])
+    await browser.goto(urls.admin)
+    await expect(browser).to_have_url(_suffix_re("/hub/admin"))
+
+
+def bulk_create_users(app, n, prefix="temp_user_", first=1):
+    """Create n users with the default 'user' role in a single commit
+
+    users are named {prefix}{i}, numbered from `first`
+    """
+    user_role = orm.Role.find(app.db, "user")
+    orm_users = [
+        orm.User(name=f"{prefix}{i}", roles=[user_role])
+        for i in range(first, first + n)
+    ]
+    app.db.add_all(orm_users)
+    app.db.commit()
+    return [app.users[orm_user] for orm_user in orm_users]
+
 
+async def snapshot_admin_counts(browser):
+    """Count the user rows and server action buttons on the admin page
 
-def create_list_of_users(create_user_with_scopes, n):
-    return [create_user_with_scopes("self") for i in range(n)]
+    Collected in a single evaluate, buttons are counted by their label.
+    """
+    return await browser.evaluate(
+        """() => {
+            const labels = [
+                ...document.querySelectorAll(
+                    "[data-testid=user-row-server-activity] button"
+                ),
+            ].map((btn) => btn.textContent.trim());
+            const count = (label) => labels.filter((l) => l === label).length;
+            return {
+                users: document.querySelectorAll("[data-testid=user-row-name]")
+                    .length,
+                start: count("Start Server"),
+                stop: count("Stop Server"),
+                spawn: count("Spawn Page"),
+                access: count("Access Server"),
+            };
+        }"""
+    )
 
 
-async def test_start_stop_all_servers_on_admin_page(app, browser, admin_user):
+async def test_start_stop_all_servers_on_admin_page(
+    app, browser, urls, admin_storage_state
+):
     """verifying of working "Start All"/"Stop All" buttons"""
 
-    await open_admin_page(app, browser, admin_user)
+    await open_admin_page(browser, urls, admin_storage_state)
     # get total count of users from db
     users_count_db = app.db.query(orm.User).count()
     start_all_btn = browser.get_by_test_id("start-all")
@@ -987,31 +1070,33 @@ async def test_start_stop_all_servers_on_admin_page(app, browser, admin_user):
     await expect(start_all_btn).to_be_enabled()
     await expect(stop_all_btn).to_be_enabled()
 
-    users = browser.get_by_test_id("user-row-name")
-    # verify that all servers are not started
-    # users´numbers are the same as numbers of the start button and the Spawn page button
-    # no Stop server buttons are displayed
-    # no access buttons are displayed
     btns_start = browser.get_by_test_id("user-row-server-activity").get_by_role(
         "button", name="Start Server"
     )
     btns_stop = browser.get_by_test_id("user-row-server-activity").get_by_role(
         "button", name="Stop Server"
     )
-    btns_spawn = browser.get_by_test_id("user-row-server-activity").get_by_role(
-        "button", name="Spawn Page"
+    # all servers are stopped:
+    # every user has the Start server and the Spawn page buttons,
+    # no Stop server or Access buttons are displayed
+    all_stopped = dict(
+        users=users_count_db,
+        start=users_count_db,
+        spawn=users_count_db,
+        stop=0,
+        access=0,
     )
-    btns_access = browser.get_by_test_id("user-row-server-activity").get_by_role(
-        "button", name="Access Server"
+    # all servers are started:
+    # every user has the Stop server and the Access buttons,
+    # no Start server or Spawn page buttons are displayed
+    all_started = dict(
+        users=users_count_db,
+        start=0,
+        spawn=0,
+        stop=users_count_db,
+        access=users_count_db,
     )
-
-    assert (
-        await btns_start.count()
-        == await btns_spawn.count()
-        == await users.count()
-        == users_count_db
-    )
-    assert await btns_stop.count() == await btns_access.count() == 0
+    assert await snapshot_admin_counts(browser) == all_stopped
 
     # start all servers via the Start All
     await start_all_btn.click()
@@ -1019,73 +1104,65 @@ async def test_start_stop_all_servers_on_admin_page(app, browser, admin_user):
     await expect(start_all_btn).to_be_enabled()
     await expect(stop_all_btn).to_be_enabled()
 
-    for btn_start in await btns_start.all():
-        await btn_start.wait_for(state="hidden")
-    # users´numbers are the same as numbers of the stop button and the Access button
-    # no Start server buttons are displayed
-    # no Spawn page buttons are displayed
-    assert await btns_start.count() == await btns_spawn.count() == 0
-    assert (
-        await btns_stop.count()
-        == await btns_access.count()
-        == await users.count()
-        == users_count_db
-    )
+    await expect(btns_start).to_have_count(0, timeout=_SPAWN_TIMEOUT)
+    assert await snapshot_admin_counts(browser) == all_started
+
     # stop all servers via the Stop All
     await stop_all_btn.click()
-    for btn_stop in await btns_stop.all():
-        await btn_stop.wait_for(state="hidden")
+    await expect(btns_stop).to_have_count(0, timeout=_SPAWN_TIMEOUT)
     # verify that all servers are stopped
-    # users´numbers are the same as numbers of the start button and the Spawn page button
-    # no Stop server buttons are displayed
-    # no access buttons are displayed
     await expect(start_all_btn).to_be_enabled()
     await expect(stop_all_btn).to_be_enabled()
-    assert (
-        await btns_start.count()
-        == await btns_spawn.count()
-        == await users.count()
-        == users_count_db
-    )
+    assert await snapshot_admin_counts(browser) == all_stopped
 
 
-@pytest.mark.parametrize("added_count_users", [10, 49, 50, 51, 99, 100, 101])
-async def test_paging_on_admin_page(
-    app, browser, admin_user, added_count_users, create_user_with_scopes
-):
-    """verifying of displaying number of total users on the admin page and navigation with "Previous"/"Next" buttons"""
+async def test_paging_on_admin_page(app, browser, urls, admin_storage_state):
+    """verifying of displaying number of total users on the admin page and navigation with "Previous"/"Next" buttons
 
-    create_list_of_users(create_user_with_scopes, added_count_users)
-    await open_admin_page(app, browser, admin_user)
-    # get total count of users from db
-    users_count_db = app.db.query(orm.User).count()
-    # get total count of users from UI page
+    One user population is grown through all the checked sizes,
+    rather than rebuilt from scratch for each of them.
+    """
+
+    # users already in the db, before this test adds its own
+    baseline_user_count = app.db.query(orm.User).count()
     displaying = browser.get_by_text("Displaying")
     btn_previous = browser.get_by_role("button", name="Previous")
     btn_next = browser.get_by_role("button", name="Next")
-    # verify "Previous"/"Next" button clickability depending on users number on the page
-    await expect(displaying).to_have_text(
-        re.compile(".*" + f"1-{min(users_count_db, 50)}" + ".*")
-    )
-    if users_count_db > 50:
-        await expect(btn_next.locator("//span")).to_have_class("active-pagination")
-        # click on Next button
-        await btn_next.click()
-        if users_count_db <= 100:
-            await expect(displaying).to_have_text(
-                re.compile(".*" + f"51-{users_count_db}" + ".*")
+    added = 0
+    # sizes around the page size (50 users)
+    for added_count_users in [10, 49, 50, 51, 99, 100, 101]:
+        bulk_create_users(app, added_count_users - added, first=added + 1)
+        added = added_count_users
+        await open_admin_page(browser, urls, admin_storage_state)
+        # total count of users in the db
+        users_count_db = baseline_user_count + added_count_users
+        # verify "Previous"/"Next" button clickability depending on users number on the page
+        await expect(displaying).to_have_text(
+            _suffix_re(f"1-{min(users_count_db, 50)}")
+        )
+        if users_count_db > 50:
+            await expect(btn_next.locator("span")).to_have_class("active-pagination")
+            # click on Next button
+            await btn_next.click()
+            if users_count_db <= 100:
+                await expect(displaying).to_have_text(
+                    _suffix_re(f"51-{users_count_db}")
+                )
+            else:
+                await expect(displaying).to_have_text(_suffix_re("51-100"))
+                await expect(btn_next.locator("span")).to_have_class(
+                    "active-pagination"
+                )
+            await expect(btn_previous.locator("span")).to_have_class(
+                "active-pagination"
             )
+            # click on Previous button
+            await btn_previous.click()
         else:
-            await expect(displaying).to_have_text(re.compile(".*" + "51-100" + ".*"))
-            await expect(btn_next.locator("//span")).to_have_class("active-pagination")
-        await expect(btn_previous.locator("//span")).to_have_class("active-pagination")
-        # click on Previous button
-        await btn_previous.click()
-    else:
-        await expect(btn_next.locator("//span")).to_have_class("inactive-pagination")
-        await expect(btn_previous.locator("//span")).to_have_class(
-            "inactive-pagination"
-        )
+            await expect(btn_next.locator("span")).to_have_class("inactive-pagination")
+            await expect(btn_previous.locator("span")).to_have_class(
+                "inactive-pagination"
+            )
 
 
 @pytest.mark.parametrize(
@@ -1104,106 +1181,121 @@ async def test_paging_on_admin_page(
 async def test_search_on_admin_page(
     app,
     browser,
-    admin_user,
-    create_user_with_scopes,
+    urls,
+    admin_storage_state,
     added_count_users,
     search_value,
 ):
-    create_list_of_users(create_user_with_scopes, added_count_users)
-    await open_admin_page(app, browser, admin_user)
-    element_search = browser.locator('//input[@name="user_search"]')
+    bulk_create_users(app, added_count_users)
+    await open_admin_page(browser, urls, admin_storage_state)
+    element_search = browser.locator("input[name=user_search]")
     await element_search.click()
-    await element_search.fill(search_value, force=True)
-    await browser.wait_for_load_state("networkidle")
+
+    def is_search_response(response):
+        """The users request sent by the (debounced) search input"""
+        url = urlparse(response.url)
+        return (
+            url.path.endswith("/hub/api/users")
+            and parse_qs(url.query).get("name_filter") == [search_value]
+            and response.ok
+        )
+
+    async with browser.expect_response(is_search_response):
+        await element_search.fill(search_value, force=True)
     # get the result of the search from db
     users_count_db_filtered = (
         app.db.query(orm.User).filter(orm.User.name.like(f'%{search_value}%')).count()
     )
     # get the result of the search
-    filtered_list_on_page = browser.locator('//tr[@class="user-row"]')
+    filtered_list_on_page = browser.locator("tr.user-row")
     displaying = browser.get_by_text("Displaying")
     if users_count_db_filtered <= 50:
         await expect(filtered_list_on_page).to_have_count(users_count_db_filtered)
         start = 1 if users_count_db_filtered else 0
         await expect(displaying).to_contain_text(
-            re.compile(f"{start}-{users_count_db_filtered}")
+            _suffix_re(f"{start}-{users_count_db_filtered}")
         )
         # check that users names contain the search value in the filtered list
         for element in await filtered_list_on_page.get_by_test_id(
             "user-row-name"
         ).all():
-            await expect(element).to_contain_text(re.compile(f".*{search_value}.*"))
+            await expect(element).to_contain_text(_suffix_re(search_value))
     else:
         await expect(filtered_list_on_page).to_have_count(50)
-        await expect(displaying).to_contain_text(re.compile("1-50"))
+        await expect(displaying).to_contain_text(_suffix_re("1-50"))
         # click on Next button to verify that the rest part of filtered list is displayed on the next page
         await browser.get_by_role("button", name="Next").click()
-        filtered_list_on_next_page = browser.locator('//tr[@class="user-row"]')
+        filtered_list_on_next_page = browser.locator("tr.user-row")
         await expect(filtered_list_on_page).to_have_count(users_count_db_filtered - 50)
         for element in await filtered_list_on_next_page.get_by_test_id(
             "user-row-name"
         ).all():
-            await expect(element).to_contain_text(re.compile(f".*{search_value}.*"))
+            await expect(element).to_contain_text(_suffix_re(search_value))
+
+
+# the cell holding a user's server action buttons and links
+_ACTIONS_CELL = "td[data-testid=user-row-server-activity]"
 
 
 async def test_start_stop_server_on_admin_page(
     app,
     browser,
-    admin_user,
-    create_user_with_scopes,
+    urls,
+    admin_storage_state,
 ):
     async def click_start_server(browser, username):
         """start the server for one user via the Start Server button, index = 0 or 1"""
-        start_btn_xpath = f'//a[contains(@href, "spawn/{username}")]/preceding-sibling::button[contains(@class, "start-button")]'
-        start_btn = browser.locator(start_btn_xpath)
-        await expect(start_btn).to_be_enabled()
+        start_btn = browser.locator(
+            f'{_ACTIONS_CELL}:has(a[href*="spawn/{username}"]) button.start-button'
+        )
         await start_btn.click()
 
     async def click_spawn_page(browser, username):
         """spawn the server for one user via the Spawn page button, index = 0 or 1"""
-        spawn_btn_xpath = f'//a[contains(@href, "spawn/{username}")]/button[contains(@class, "btn-light")]'
-        spawn_btn = browser.locator(spawn_btn_xpath)
-        await expect(spawn_btn).to_be_enabled()
+        spawn_btn = browser.locator(f'a[href*="spawn/{username}"] > button.btn-light')
         async with browser.expect_navigation(url=f"**/user/{username}/"):
             await spawn_btn.click()
 
     async def click_access_server(browser, username):
         """access to the server for users via the Access Server button"""
-        access_btn_xpath = f'//a[contains(@href, "user/{username}")]/button[contains(@class, "btn-primary")]'
-        access_btn = browser.locator(access_btn_xpath)
-        await expect(access_btn).to_be_enabled()
+        access_btn = browser.locator(f'a[href*="user/{username}"] > button.btn-primary')
         await access_btn.click()
         await browser.go_back()
 
     async def click_stop_button(browser, username):
         """stop the server for one user via the Stop Server button"""
-        stop_btn_xpath = f'//a[contains(@href, "user/{username}")]/preceding-sibling::button[contains(@class, "stop-button")]'
-        stop_btn = browser.locator(stop_btn_xpath)
-        await expect(stop_btn).to_be_enabled()
+        stop_btn = browser.locator(
+            f'{_ACTIONS_CELL}:has(a[href*="user/{username}"]) button.stop-button'
+        )
         await stop_btn.click()
 
-    user1, user2 = create_list_of_users(create_user_with_scopes, 2)
-    await open_admin_page(app, browser, admin_user)
-    await browser.wait_for_load_state("networkidle")
-    users = await browser.locator('//td[@data-testid="user-row-name"]').all()
-    users_list = [await user.text_content() for user in users]
-    users_list = [user.strip() for user in users_list]
-    assert {user1.name, user2.name}.issubset({e for e in users_list})
+    user1, user2 = bulk_create_users(app, 2)
+    await open_admin_page(browser, urls, admin_storage_state)
+    # wait for the user list to be rendered
+    await expect(browser.locator("tr.user-row")).to_have_count(
+        app.db.query(orm.User).count()
+    )
+    # read each row's user name and Spawn Page link in one table scan
+    rows = await browser.locator("tr.user-row").evaluate_all(
+        """rows => rows.map(tr => ({
+            name: tr.querySelector("[data-testid=user-row-name]").textContent.trim(),
+            spawnHref: tr
+                .querySelector('[data-testid=user-row-server-activity] a[href*="spawn/"]')
+                ?.getAttribute("href"),
+        }))"""
+    )
+    users_list = [row["name"] for row in rows]
+    assert {user1.name, user2.name}.issubset(users_list)
 
     # check that all users have correct link for Spawn Page
-    spawn_page_btns = browser.locator(
-        '//*[@data-testid="user-row-server-activity"]//a[contains(@href, "spawn/")]'
-    )
-    spawn_page_btns_list = await spawn_page_btns.all()
-    for user, spawn_page_btn in zip(users, spawn_page_btns_list):
-        user_from_table = await user.text_content()
-        user_from_table = user_from_table.strip()
-        link = await spawn_page_btn.get_attribute('href')
-        assert f"/spawn/{user_from_table}" in link
+    for row in rows:
+        assert f"/spawn/{row['name']}" in row["spawnHref"]
 
     # click on Start button
     await click_start_server(browser, user1.name)
-    await expect(browser.get_by_role("button", name="Stop Server")).to_have_count(1)
+    await expect(browser.get_by_role("button", name="Stop Server")).to_have_count(
+        1, timeout=_SPAWN_TIMEOUT
+    )
     await expect(browser.get_by_role("button", name="Start Server")).to_have_count(
         len(users_list) - 1
     )
@@ -1213,11 +1305,10 @@ async def test_start_stop_server_on_admin_page(
 
     # click on Spawn page button
     await click_spawn_page(browser, user2.name)
-    await expect(browser).to_have_url(re.compile(".*" + f"/user/{user2.name}/"))
+    await expect(browser).to_have_url(_suffix_re(f"/user/{user2.name}/"))
 
     # open/return to the Admin page
-    admin_page = url_path_join(public_host(app), app.hub.base_url, "admin")
-    await browser.goto(admin_page)
+    await browser.goto(urls.admin)
     await expect(browser.get_by_role("button", name="Stop Server")).to_have_count(2)
     await expect(browser.get_by_role("button", name="Access Server")).to_have_count(2)
     await expect(browser.get_by_role("button", name="Start Server")).to_have_count(
@@ -1231,12 +1322,14 @@ async def test_start_stop_server_on_admin_page(
         len(users_list) - 2
     )
 
-    # click on Stop button for both users
-    [
-        await click_stop_button(browser, username)
-        for username in (user1.name, user2.name)
-    ]
-    await expect(browser.get_by_role("button", name="Stop Server")).to_have_count(0)
+    # click on Stop button for both users, stopping their servers concurrently
+    await asyncio.gather(
+        click_stop_button(browser, user1.name),
+        click_stop_button(browser, user2.name),
+    )
+    await expect(browser.get_by_role("button", name="Stop Server")).to_have_count(
+        0, timeout=_SPAWN_TIMEOUT
+    )
     await expect(browser.get_by_role("button", name="Access Server")).to_have_count(0)
     await expect(browser.get_by_role("button", name="Start Server")).to_have_count(
         len(users_list)
@@ -1255,16 +1348,16 @@ async def test_start_stop_server_on_admin_page(
         "valid-prefix-invalid-other-prefix",
     ],
 )
-async def test_login_xsrf_initial_cookies(app, browser, case, username):
+async def test_login_xsrf_initial_cookies(app, browser, urls, case, username):
     """Test that login works with various initial states for xsrf tokens
 
     Page will be reloaded with correct values
     """
     hub_root = public_host(app)
-    hub_url = url_path_join(public_host(app), app.hub.base_url)
+    hub_url = urls.hub_base
     hub_parent = hub_url.rstrip("/").rsplit("/", 1)[0] + "/"
     login_url = url_path_join(
-        hub_url, url_concat("login", {"next": url_path_join(app.base_url, "/hub/home")})
+        hub_url, _qjoin("login", {"next": url_path_join(app.base_url, "/hub/home")})
     )
     # start with all cookies cleared
     await browser.context.clear_cookies()
@@ -1324,6 +1417,7 @@ def _cookie_dict(cookie_list):
 async def test_singleuser_xsrf(
     app,
     browser,
+    urls,
     user,
     create_user_with_scopes,
     full_spawn,
@@ -1336,22 +1430,24 @@ async def test_singleuser_xsrf(
 
     browser_user = create_user_with_scopes("self", "access:servers")
     # login browser_user
-    login_url = url_path_join(public_host(app), app.hub.base_url, "login")
-    await browser.goto(login_url)
+    await browser.goto(urls.login)
     await login(browser, browser_user.name, browser_user.name)
     # end up at single-user
-    await expect(browser).to_have_url(re.compile(rf".*/user/{browser_user.name}/.*"))
+    await expect(browser).to_have_url(
+        _suffix_re(f"/user/{browser_user.name}/"), timeout=_SPAWN_TIMEOUT
+    )
     # wait for target user to start, too
     await target_start
     await app.proxy.add_user(target_user)
 
     # visit target user, sets credentials for second server
     await browser.goto(public_url(app, target_user))
-    await expect(browser).to_have_url(re.compile(r".*/oauth2/authorize"))
-    auth_button = browser.locator('//input[@type="submit"]')
-    await expect(auth_button).to_be_enabled()
+    await expect(browser).to_have_url(_suffix_re("/oauth2/authorize"))
+    auth_button = browser.locator("input[type=submit]")
     await auth_button.click()
-    await expect(browser).to_have_url(re.compile(rf".*/user/{target_user.name}/.*"))
+    await expect(browser).to_have_url(
+        _suffix_re(f"/user/{target_user.name}/"), timeout=_SPAWN_TIMEOUT
+    )
 
     # at this point, we are on a page served by target_user,
     # logged in as browser_user
@@ -1383,7 +1479,7 @@ async def test_singleuser_xsrf(
     async def fetch_user_page(path, params=None):
         url = url_path_join(public_url(app, browser_user), path)
         if params:
-            url = url_concat(url, params)
+            url = _qjoin(url, params)
         status = await browser.evaluate(
             """
             async (user_url) => {
@@ -1494,7 +1590,8 @@ async def test_singleuser_xsrf(
     )
     await browser.goto(url)
     await expect(browser).to_have_url(
-        re.compile(rf".*/user/{browser_user.name}/{server_name}/.*")
+        _suffix_re(f"/user/{browser_user.name}/{server_name}/"),
+        timeout=_SPAWN_TIMEOUT,
     )
     # from named server URL, make sure we can talk to a kernel
     token = browser_user.new_api_token(scopes=["access:servers!user"])
@@ -31,7 +31,7 @@ import asyncio
 import os
 import sys
 from concurrent.futures import ThreadPoolExecutor
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 from unittest import mock
 from urllib.parse import urlparse
 
@@ -43,6 +43,7 @@ from traitlets import Bool, Dict, default
 from .. import metrics, orm, roles
 from ..app import JupyterHub
 from ..auth import PAMAuthenticator
+from ..proxy import ConfigurableHTTPProxy
 from ..spawner import SimpleLocalProcessSpawner
 from ..utils import random_port, url_path_join, utcnow
 from .utils import AsyncSession, public_url, ssl_setup
@@ -235,6 +236,12 @@ class MockHub(JupyterHub):
     def _default_log_level(self):
         return 10
 
+    @default('cookie_secret_file')
+    def _default_cookie_secret_file(self):
+        # not in the cwd, shared by parallel (xdist) workers,
+        # removed with the Hub's temporary directory in stop()
+        return os.path.join(self._tmp_dir.name, 'jupyterhub_cookie_secret')
+
     # MockHub additional traits
     external_certs = Dict()
 
@@ -288,6 +295,21 @@ class MockHub(JupyterHub):
         # reconnect tornado_settings so that mocks can update the real thing
         self.tornado_settings = self.users.settings = self.tornado_application.settings
 
+    def init_proxy(self):
+        super().init_proxy()
+        if not isinstance(self.proxy, ConfigurableHTTPProxy):
+            return
+        # the default api port and pid file in the cwd
+        # would be shared by parallel (xdist) workers
+        proxy_config = self.config.get('ConfigurableHTTPProxy', {})
+        if 'api_url' not in proxy_config:
+            proto = 'https' if self.internal_ssl else 'http'
+            self.proxy.api_url = f'{proto}://127.0.0.1:{random_port()}'
+        if 'pid_file' not in proxy_config:
+            self.proxy.pid_file = os.path.join(
+                self._tmp_dir.name, 'jupyterhub-proxy.pid'
+            )
+
     def init_services(self):
         # explicitly expire services before reinitializing
         # this only happens in tests because re-initialize
@@ -326,6 +348,7 @@ class MockHub(JupyterHub):
         self.log.handlers.clear()
 
     async def initialize(self, argv=None):
+        self._tmp_dir = TemporaryDirectory()
         self.pid_file = NamedTemporaryFile(delete=False).name
         self.db_file = NamedTemporaryFile()
         self.db_url = os.getenv('JUPYTERHUB_TEST_DB_URL') or self.db_file.name
@@ -368,6 +391,7 @@ class MockHub(JupyterHub):
         self._atexit_ran = True
         super().stop()
         self.db_file.close()
+        self._tmp_dir.cleanup()
 
     async def login_user(self, name):
         """Login a user by name, returning her cookies."""